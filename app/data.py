@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Literal, TypedDict
+from typing import Dict, FrozenSet, List, Literal, TypedDict
 
 
 class Product(TypedDict):
@@ -116,6 +116,33 @@ BANKS: List[Bank] = [
     },
 ]
 
-# 常用贸易术语与币种，供前端选择并用于校验
-INCOTERMS: List[str] = ["FOB", "CIF", "EXW", "DAP"]
-CURRENCIES: List[str] = ["USD", "CNY", "EUR", "GBP"]
+# 常用贸易术语与币种；列表保持展示顺序供前端选择，集合用于 O(1) 校验
+INCOTERMS_LIST: List[str] = ["FOB", "CIF", "EXW", "DAP"]
+CURRENCIES_LIST: List[str] = ["USD", "CNY", "EUR", "GBP"]
+INCOTERMS: FrozenSet[str] = frozenset(INCOTERMS_LIST)
+CURRENCIES: FrozenSet[str] = frozenset(CURRENCIES_LIST)
+
+# 启动时预计算的派生字符串，按 id 存放在独立映射中，
+# 目录对象本身保持不变，/api/options 的响应内容不受影响
+SUGGESTED_PRICE_RANGE_STR_BY_ID: Dict[str, str] = {
+    p["id"]: f"{p['price_range'][0]:.2f} - {p['price_range'][1]:.2f}"
+    for p in PRODUCTS
+}
+BANK_INFO_STR_BY_ID: Dict[str, str] = {
+    b["id"]: (
+        f"{b['name']} / {b['account_name']} / {b['account_number']} "
+        f"(SWIFT: {b['swift']})"
+    )
+    for b in BANKS
+}
+
+# 达到参考容量 85% 即提示接近容量，整数阈值省去每次请求的浮点乘法
+CAPACITY_SOFT_THRESHOLD_BY_ID: Dict[str, int] = {
+    c["id"]: c["capacity"] * 85 // 100 for c in CONTAINERS
+}
+
+# 按 id 建立索引，报价接口按 id 查找时无需遍历列表
+PRODUCTS_BY_ID: Dict[str, Product] = {p["id"]: p for p in PRODUCTS}
+CONTAINERS_BY_ID: Dict[str, Container] = {c["id"]: c for c in CONTAINERS}
+PAYMENT_METHODS_BY_ID: Dict[str, PaymentMethod] = {m["id"]: m for m in PAYMENT_METHODS}
+BANKS_BY_ID: Dict[str, Bank] = {b["id"]: b for b in BANKS}
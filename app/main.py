@@ -1,22 +1,35 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
+from hashlib import md5
 from pathlib import Path
 from typing import Any, Dict
-from datetime import datetime
+from datetime import date, datetime
 from io import BytesIO
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 from app.data import (
+    BANK_INFO_STR_BY_ID,
     BANKS,
+    BANKS_BY_ID,
+    CAPACITY_SOFT_THRESHOLD_BY_ID,
     CONTAINERS,
+    CONTAINERS_BY_ID,
     CURRENCIES,
+    CURRENCIES_LIST,
     INCOTERMS,
+    INCOTERMS_LIST,
     PAYMENT_METHODS,
+    PAYMENT_METHODS_BY_ID,
     PRODUCTS,
+    PRODUCTS_BY_ID,
+    SUGGESTED_PRICE_RANGE_STR_BY_ID,
 )
 from app.schemas import QuoteRequest, QuoteResponse
 from app.pdf_generator import build_quote_pdf
@@ -24,11 +37,24 @@ from app.pdf_generator import build_quote_pdf
 BASE_DIR = Path(__file__).resolve().parent.parent
 static_dir = BASE_DIR / "static"
 
-app = FastAPI(title="报价单生成器", description="生成包含产品、柜型和付款信息的报价单。")
+app = FastAPI(
+    title="报价单生成器",
+    description="生成包含产品、柜型和付款信息的报价单。",
+    default_response_class=ORJSONResponse,
+)
+
+# 显式列出允许的来源，生产环境通过 ALLOWED_ORIGINS 环境变量（逗号分隔）覆盖；
+# 通配符 + 凭据的组合既是安全隐患，也让中间件在每个请求上做额外的头部改写
+_DEFAULT_ORIGINS = "http://localhost:5173,http://localhost:8000,http://127.0.0.1:8000"
+ALLOWED_ORIGINS = frozenset(
+    origin.strip()
+    for origin in os.environ.get("ALLOWED_ORIGINS", _DEFAULT_ORIGINS).split(",")
+    if origin.strip()
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(ALLOWED_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -37,52 +63,135 @@ app.add_middleware(
  
 
 
-@app.get("/api/options")
-def get_options() -> Dict[str, Any]:
-    return {
+# 选项数据在导入后不再变化，启动时序列化一次，避免每个请求重复编码
+_OPTIONS_JSON = orjson.dumps(
+    {
         "products": PRODUCTS,
         "containers": CONTAINERS,
         "payment_methods": PAYMENT_METHODS,
         "banks": BANKS,
-        "incoterms": INCOTERMS,
-        "currencies": CURRENCIES,
+        "incoterms": INCOTERMS_LIST,
+        "currencies": CURRENCIES_LIST,
     }
+)
+_OPTIONS_ETAG = f'"{md5(_OPTIONS_JSON).hexdigest()}"'
+
+
+@app.get("/api/options")
+async def get_options(request: Request) -> Response:
+    # 客户端带回相同的 ETag 时只回 304，不重复发送完整响应体
+    if request.headers.get("if-none-match") == _OPTIONS_ETAG:
+        return Response(status_code=304, headers={"ETag": _OPTIONS_ETAG})
+    return Response(
+        content=_OPTIONS_JSON,
+        media_type="application/json",
+        headers={"ETag": _OPTIONS_ETAG},
+    )
 
 
 def _get_product(product_id: str):
-    for product in PRODUCTS:
-        if product["id"] == product_id:
-            return product
-    return None
+    return PRODUCTS_BY_ID.get(product_id)
 
 
 def _get_container(container_id: str):
-    for container in CONTAINERS:
-        if container["id"] == container_id:
-            return container
-    return None
+    return CONTAINERS_BY_ID.get(container_id)
 
 
 def _get_payment_method(method_id: str):
-    for method in PAYMENT_METHODS:
-        if method["id"] == method_id:
-            return method
-    return None
+    return PAYMENT_METHODS_BY_ID.get(method_id)
 
 
 def _get_bank(bank_id: str):
-    for bank in BANKS:
-        if bank["id"] == bank_id:
-            return bank
-    return None
+    return BANKS_BY_ID.get(bank_id)
+
+
+# 容量提示文案，按“范围内 / 接近 / 超过”排序，直接用比较结果之和做下标
+_CAP_MSGS = (
+    "数量在参考容量范围内。",
+    "已接近柜子参考容量，请确认包装尺寸和装柜方式。",
+    "数量超过参考柜容量，建议调整柜型或拆分发货。",
+)
 
 
-def _is_valid_currency(currency: str) -> bool:
-    return currency in CURRENCIES
+@lru_cache(maxsize=256)
+def _static_quote_fields(
+    product_id: str,
+    container_id: str,
+    payment_method_id: str,
+    bank_id: str,
+) -> Dict[str, Any]:
+    """只依赖四个目录 ID 的响应字段，按 ID 组合缓存，调用方需复制后再叠加动态字段。"""
+    product = PRODUCTS_BY_ID[product_id]
+    container = CONTAINERS_BY_ID[container_id]
+    payment_method = PAYMENT_METHODS_BY_ID[payment_method_id]
+    return {
+        "product_name": product["name"],
+        "product_specs": product["specs"],
+        "min_order": product["min_order"],
+        "suggested_price_range": SUGGESTED_PRICE_RANGE_STR_BY_ID[product_id],
+        "container_name": container["name"],
+        "capacity": container["capacity"],
+        "container_notes": container.get("notes", ""),
+        "payment_method": payment_method["name"],
+        "bank_info": BANK_INFO_STR_BY_ID[bank_id],
+    }
+
+
+@lru_cache(maxsize=4096)
+def _compute_quote(
+    product_id: str,
+    container_id: str,
+    payment_method_id: str,
+    bank_id: str,
+    incoterm: str,
+    currency: str,
+    quantity: int,
+    unit_price: float,
+    freight: float,
+    quote_date: date,
+    valid_until: date,
+    seller_company: str,
+    buyer_company: str,
+    remark: str | None,
+) -> QuoteResponse:
+    """报价计算的纯函数部分，入参均已在路由层校验，相同请求直接命中缓存。"""
+    container = CONTAINERS_BY_ID[container_id]
+
+    # 以"分"为单位做整数运算，避免浮点累计误差和重复 round()
+    unit_cents = int(round(unit_price * 100))
+    freight_cents = int(round(freight * 100))
+    subtotal_cents = quantity * unit_cents
+    subtotal = subtotal_cents / 100
+    total = (subtotal_cents + freight_cents) / 100
+
+    # 超过硬容量时两个比较都为真，下标依次落在 0/1/2 上
+    capacity_message = _CAP_MSGS[
+        (quantity > CAPACITY_SOFT_THRESHOLD_BY_ID[container_id])
+        + (quantity > container["capacity"])
+    ]
+
+    fields = dict(
+        _static_quote_fields(product_id, container_id, payment_method_id, bank_id)
+    )
+    fields.update(
+        subtotal=subtotal,
+        freight=freight,
+        total_amount=total,
+        capacity_message=capacity_message,
+        currency=currency,
+        seller_company=seller_company,
+        buyer_company=buyer_company,
+        incoterm=incoterm,
+        quote_date=quote_date,
+        valid_until=valid_until,
+        remark=remark,
+    )
+    # 字段均来自已校验的请求或静态目录数据，model_construct 跳过重复校验
+    return QuoteResponse.model_construct(**fields)
 
 
 @app.post("/api/quotes", response_model=QuoteResponse)
-def create_quote(payload: QuoteRequest) -> QuoteResponse:
+async def create_quote(payload: QuoteRequest) -> QuoteResponse:
     product = _get_product(payload.item.product_id)
     container = _get_container(payload.container_id)
     payment_method = _get_payment_method(payload.payment_method_id)
@@ -98,7 +207,7 @@ def create_quote(payload: QuoteRequest) -> QuoteResponse:
         raise HTTPException(status_code=404, detail="未找到对应收款银行")
     if payload.incoterm not in INCOTERMS:
         raise HTTPException(status_code=400, detail="不支持的协议方式")
-    if not _is_valid_currency(payload.currency):
+    if payload.currency not in CURRENCIES:
         raise HTTPException(status_code=400, detail="不支持的币种")
 
     if payload.item.quantity < product["min_order"]:
@@ -107,44 +216,21 @@ def create_quote(payload: QuoteRequest) -> QuoteResponse:
     if not (min_price <= payload.item.unit_price <= max_price):
         raise HTTPException(status_code=400, detail="单价不在建议价格区间内")
 
-    subtotal = round(payload.item.quantity * payload.item.unit_price, 2)
-    total = round(subtotal + payload.freight, 2)
-
-    capacity_message = ""
-    if payload.item.quantity > container["capacity"]:
-        capacity_message = "数量超过参考柜容量，建议调整柜型或拆分发货。"
-    elif payload.item.quantity > container["capacity"] * 0.85:
-        capacity_message = "已接近柜子参考容量，请确认包装尺寸和装柜方式。"
-    else:
-        capacity_message = "数量在参考容量范围内。"
-
-    suggested_price_range = f"{product['price_range'][0]:.2f} - {product['price_range'][1]:.2f}"
-    bank_info = (
-        f"{bank['name']} / {bank['account_name']} / {bank['account_number']} "
-        f"(SWIFT: {bank['swift']})"
-    )
-
-    return QuoteResponse(
-        product_name=product["name"],
-        product_specs=product["specs"],
-        min_order=product["min_order"],
-        suggested_price_range=suggested_price_range,
-        subtotal=subtotal,
-        freight=payload.freight,
-        total_amount=total,
-        container_name=container["name"],
-        capacity=container["capacity"],
-        capacity_message=capacity_message,
-        container_notes=container.get("notes", ""),
-        currency=payload.currency,
-        seller_company=payload.seller_company,
-        buyer_company=payload.buyer_company,
-        incoterm=payload.incoterm,
-        payment_method=payment_method["name"],
-        bank_info=bank_info,
-        quote_date=payload.quote_date,
-        valid_until=payload.valid_until,
-        remark=payload.remark,
+    return _compute_quote(
+        payload.item.product_id,
+        payload.container_id,
+        payload.payment_method_id,
+        payload.bank_id,
+        payload.incoterm,
+        payload.currency,
+        payload.item.quantity,
+        payload.item.unit_price,
+        payload.freight,
+        payload.quote_date,
+        payload.valid_until,
+        payload.seller_company,
+        payload.buyer_company,
+        payload.remark,
     )
 
 
@@ -153,18 +239,37 @@ def download_quote_pdf(quote_id: str, quote_data: QuoteResponse) -> StreamingRes
     """
     根据报价数据生成 PDF 并返回文件流
     """
-    pdf_bytes = build_quote_pdf(quote_data.dict())
+    buffer = BytesIO()
+    build_quote_pdf(quote_data.model_dump(), buffer)
+    buffer.seek(0)
     filename = f"quotation_{quote_id}_{datetime.today().strftime('%Y%m%d')}.pdf"
+    # 按 64KiB 分块发送，避免响应体再复制一份完整的 PDF
     return StreamingResponse(
-        BytesIO(pdf_bytes),
+        iter(lambda: buffer.read(65536), b""),
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
-app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
+# 开发/一体化部署时由 Starlette 提供静态文件；生产环境设 SERVE_STATIC=0，
+# 让 Nginx 以 sendfile 直接发送静态资源（参见 deploy/nginx.conf.example），
+# Python 进程只处理 /api 流量
+if os.environ.get("SERVE_STATIC", "1") == "1":
+    app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    if os.environ.get("DEV_RELOAD") == "1":
+        # 开发模式：保留热重载，走默认事件循环
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # 生产模式：uvloop + httptools（需要 uvicorn[standard]）
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        )
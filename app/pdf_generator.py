@@ -1,43 +1,65 @@
-from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
 from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import os
 
-def build_quote_pdf(data: Dict[str, Any]) -> bytes:
+# 注册支持中文的字体（使用系统自带或打包的思源黑体），在模块加载时执行一次，
+# 避免每次生成 PDF 都重新解析字体文件
+# 这里用系统已有的 SimHei 作为示例，若部署环境不同请替换为实际字体文件
+try:
+    pdfmetrics.registerFont(TTFont("SimHei", "/System/Library/Fonts/STHeiti Medium.ttc"))
+    _FONT_NAME = "SimHei"
+except (TTFError, OSError):
+    # 字体缺失或不可读时降级使用默认字体，中文会显示为方框；生产环境请上传字体文件
+    _FONT_NAME = "Helvetica"
+
+# 样式为纯常量，构建一次后可在多个 Table 实例间复用
+_STYLES = getSampleStyleSheet()
+_STYLE_NORMAL = _STYLES["Normal"]
+_STYLE_NORMAL.fontName = _FONT_NAME
+_STYLE_NORMAL.fontSize = 10
+
+# 首行为表头的表格样式（基本信息）
+_TABLE_STYLE_HEADER = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTNAME", (0, 0), (-1, -1), _FONT_NAME),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+# 首列为表头的表格样式（产品/金额/柜型信息）
+_TABLE_STYLE_LEFT_HEADER = TableStyle([
+    ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTNAME", (0, 0), (-1, -1), _FONT_NAME),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+
+def build_quote_pdf(data: Dict[str, Any], out_stream: BinaryIO) -> None:
     """
-    根据报价数据生成 PDF，返回字节流
+    根据报价数据生成 PDF，直接写入给定的可写流
     """
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+    c = canvas.Canvas(out_stream, pagesize=A4)
     width, height = A4
 
-    # 注册支持中文的字体（使用系统自带或打包的思源黑体）
-    # 这里用系统已有的 SimHei 作为示例，若部署环境不同请替换为实际字体文件
-    font_name = "SimHei"
-    try:
-        pdfmetrics.registerFont(TTFont(font_name, "/System/Library/Fonts/STHeiti Medium.ttc"))
-    except:
-        # 降级使用默认字体，中文会显示为方框；生产环境请上传字体文件
-        font_name = "Helvetica"
+    font_name = _FONT_NAME
 
     # 标题
     c.setFont(font_name, 20)
     c.drawCentredString(width / 2, height - 30 * mm, "QUOTATION SHEET")
 
     # 基本信息表格
-    styles = getSampleStyleSheet()
-    styleN = styles["Normal"]
-    styleN.fontName = font_name
-    styleN.fontSize = 10
-
     basic_info = [
         ["报价日期", data["quote_date"], "有效期至", data["valid_until"]],
         ["卖方公司", data["seller_company"], "买方公司", data["buyer_company"]],
@@ -46,14 +68,7 @@ def build_quote_pdf(data: Dict[str, Any]) -> bytes:
     ]
 
     t = Table(basic_info, colWidths=[30 * mm, 60 * mm, 30 * mm, 60 * mm])
-    t.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTNAME", (0, 0), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    t.setStyle(_TABLE_STYLE_HEADER)
 
     from reportlab.platypus import SimpleDocTemplate, Paragraph
     frame_height = height - 70 * mm
@@ -66,20 +81,15 @@ def build_quote_pdf(data: Dict[str, Any]) -> bytes:
     c.drawString(20 * mm, y, "产品信息")
     y -= 10 * mm
 
+    cur = data["currency"]
     product_info = [
         ["产品名称", data["product_name"]],
         ["规格", data["product_specs"]],
         ["最小起订量", str(data["min_order"]) + " 件"],
-        ["建议价格区间", data["suggested_price_range"] + " " + data["currency"]],
+        ["建议价格区间", data["suggested_price_range"] + " " + cur],
     ]
     t2 = Table(product_info, colWidths=[40 * mm, 140 * mm])
-    t2.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTNAME", (0, 0), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    t2.setStyle(_TABLE_STYLE_LEFT_HEADER)
     t2.wrapOn(c, width - 40 * mm, y)
     t2.drawOn(c, 20 * mm, y - 0)
 
@@ -90,18 +100,12 @@ def build_quote_pdf(data: Dict[str, Any]) -> bytes:
     y -= 10 * mm
 
     summary_info = [
-        ["货值小计", f"{data['subtotal']:.2f} {data['currency']}"],
-        ["运费", f"{data['freight']:.2f} {data['currency']}"],
-        ["总金额", f"{data['total_amount']:.2f} {data['currency']}"],
+        ["货值小计", f"{data['subtotal']:.2f} {cur}"],
+        ["运费", f"{data['freight']:.2f} {cur}"],
+        ["总金额", f"{data['total_amount']:.2f} {cur}"],
     ]
     t3 = Table(summary_info, colWidths=[40 * mm, 60 * mm])
-    t3.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTNAME", (0, 0), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    t3.setStyle(_TABLE_STYLE_LEFT_HEADER)
     t3.wrapOn(c, width - 40 * mm, y)
     t3.drawOn(c, 20 * mm, y - 0)
 
@@ -119,13 +123,7 @@ def build_quote_pdf(data: Dict[str, Any]) -> bytes:
     if data.get("container_notes"):
         container_info.append(["备注", data["container_notes"]])
     t4 = Table(container_info, colWidths=[40 * mm, 140 * mm])
-    t4.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTNAME", (0, 0), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    t4.setStyle(_TABLE_STYLE_LEFT_HEADER)
     t4.wrapOn(c, width - 40 * mm, y)
     t4.drawOn(c, 20 * mm, y - 0)
 
@@ -140,7 +138,4 @@ def build_quote_pdf(data: Dict[str, Any]) -> bytes:
         text_obj.textLines(data["remark"])
         c.drawText(text_obj)
 
-    c.save()
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
\ No newline at end of file
+    c.save()
\ No newline at end of file
@@ -3,16 +3,20 @@ from __future__ import annotations
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
 
 class QuoteItem(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     product_id: str = Field(..., description="产品唯一标识")
     quantity: int = Field(..., gt=0, description="数量")
     unit_price: float = Field(..., gt=0, description="单价")
 
 
 class QuoteRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     seller_company: str = Field(..., description="卖方公司")
     buyer_company: str = Field(..., description="买方公司")
     incoterm: str = Field(..., description="贸易术语/协议方式")
@@ -26,15 +30,19 @@ class QuoteRequest(BaseModel):
     remark: Optional[str] = Field(None, description="备注")
     item: QuoteItem
 
-    @validator("valid_until")
-    def validate_valid_until(cls, v: date, values: dict) -> date:
-        quote_date: date | None = values.get("quote_date")
+    @field_validator("valid_until")
+    @classmethod
+    def validate_valid_until(cls, v: date, info: ValidationInfo) -> date:
+        quote_date: date | None = info.data.get("quote_date")
         if quote_date and v < quote_date:
             raise ValueError("有效期不能早于报价日期")
         return v
 
 
 class QuoteResponse(BaseModel):
+    # 响应实例会被 LRU 缓存复用，冻结后可安全地在请求间共享
+    model_config = ConfigDict(frozen=True)
+
     product_name: str
     product_specs: str
     min_order: int
@@ -54,4 +62,4 @@ class QuoteResponse(BaseModel):
     bank_info: str
     quote_date: date
     valid_until: date
-    remark: Optional[str]
+    remark: Optional[str] = None